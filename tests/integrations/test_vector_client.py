@@ -1,7 +1,13 @@
 """Test TiDB Vector Search functionality."""
 from __future__ import annotations
 
-from typing import List, Tuple
+import concurrent.futures
+import functools
+import sys
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+import numpy as np
 import sqlalchemy
 import pytest
 
@@ -15,6 +21,8 @@ try:
     )  # noqa
 
     TABLE_NAME = "tidb_vector_test"
+    SHARED_TABLE_NAME = "tidb_vector_test_shared"
+    FRESH_TABLE_NAME = "tidb_vector_test_fresh"
     CONNECTION_STRING = (
         f"mysql+pymysql://{TestConfig.TIDB_USER}:{TestConfig.TIDB_PASSWORD}@{TestConfig.TIDB_HOST}:4000/ci_integration"
         f"?ssl_verify_cert=true&ssl_verify_identity=true"
@@ -26,50 +34,426 @@ except (OSError, ImportError):
 
 ADA_TOKEN_COUNT = 1536
 
+# Shape of the `node_embeddings` fixture: (ids, documents, embeddings, metadatas).
+NodeEmbeddings = Tuple[list[str], list[str], np.ndarray, Tuple[Mapping, ...]]
+
 
-def text_to_embedding(text: str) -> List[float]:
+@functools.lru_cache(maxsize=32)
+def text_to_embedding(text: str) -> np.ndarray:
     """Convert text to a unique embedding using ASCII values."""
-    ascii_values = [float(ord(char)) for char in text]
-    # Pad or trim the list to make it of length ADA_TOKEN_COUNT
-    return ascii_values[:ADA_TOKEN_COUNT] + [0.0] * (
-        ADA_TOKEN_COUNT - len(ascii_values)
-    )
+    embedding = np.zeros(ADA_TOKEN_COUNT, dtype=np.float32)
+    # The embedding is the ASCII codes padded (or trimmed) to ADA_TOKEN_COUNT
+    raw = text.encode("ascii", errors="replace")
+    length = min(len(raw), ADA_TOKEN_COUNT)
+    embedding[:length] = np.frombuffer(raw, dtype=np.uint8, count=length)
+    # The cached array is shared between callers, make it immutable
+    embedding.setflags(write=False)
+    return embedding
+
+
+# The 3-row data set shared by the whole module, precomputed once at import
+# time. The embedding arrays are read-only, so the tuple is safe to share
+# between tests (and between pytest-xdist workers via copy-on-write fork).
+_IDS = [
+    "f8e7dee2-63b6-42f1-8b60-2d46710c1971",
+    "8dde1fbc-2522-4ca2-aedf-5dcb2966d1c6",
+    "e4991349-d00b-485c-a481-f61695f2b5ae",
+]
+_DOCUMENTS = ["foo", "bar", "baz"]
+# One contiguous (3, ADA_TOKEN_COUNT) float32 matrix instead of a list of
+# per-row arrays, so the insert path iterates views of a single buffer.
+_EMBEDDINGS = np.stack([text_to_embedding(document) for document in _DOCUMENTS])
+_EMBEDDINGS.setflags(write=False)
+# Read-only metadata rows with interned category strings: the dicts cannot
+# be mutated in place by anything they are passed to, and repeated category
+# comparisons hit the interned-identity fast path.
+_P1 = sys.intern("P1")
+_P2 = sys.intern("P2")
+_METADATAS = tuple(
+    MappingProxyType({"page": page, "category": category})
+    for page, category in ((1, _P1), (2, _P1), (3, _P2))
+)
+
+
+def _metadatas_as_dicts() -> list[dict]:
+    """Return mutable copies for insert, whose JSON column rejects proxies."""
+    return [dict(metadata) for metadata in _METADATAS]
+
+
+# Cosine distances between the ord-based embeddings above. Asserted with
+# pytest.approx rather than exact equality, so the server is free to evaluate
+# distances with FMA/SIMD kernels whose low bits differ from the scalar path.
+DIST_FOO_BAR = 0.0022719614199674387
+DIST_FOO_BAZ = 0.004691842206844599
+DIST_BAR_BAZ = 0.0005609046916807969
+
+# Dense unit-norm embeddings with a fixed seed, one row per document. The
+# ord-based vectors above are ~99.8% zero padding, which only exercises a
+# tiny prefix of the server's distance computation; these rows look like
+# real embedding output while keeping every distance reproducible.
+_DENSE = np.random.default_rng(seed=42).standard_normal(
+    (3, ADA_TOKEN_COUNT), dtype=np.float32
+)
+_DENSE /= np.linalg.norm(_DENSE, axis=1, keepdims=True)
+_DENSE.setflags(write=False)
 
 
 @pytest.fixture(scope="session")
-def node_embeddings() -> Tuple[list[str], list[str], list[list[float]], list[dict]]:
+def node_embeddings() -> NodeEmbeddings:
     """Return a list of TextNodes with embeddings."""
-    ids = [
-        "f8e7dee2-63b6-42f1-8b60-2d46710c1971",
-        "8dde1fbc-2522-4ca2-aedf-5dcb2966d1c6",
-        "e4991349-d00b-485c-a481-f61695f2b5ae",
-    ]
-    embeddings = [
-        text_to_embedding("foo"),
-        text_to_embedding("bar"),
-        text_to_embedding("baz"),
+    yield (_IDS, _DOCUMENTS, _EMBEDDINGS, _METADATAS)
+    text_to_embedding.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def shared_engine() -> sqlalchemy.engine.Engine:
+    """Return one engine shared by every client in the session.
+
+    Each TiDBVectorClient otherwise creates its own engine, paying a fresh
+    TCP + TLS + auth handshake; sharing one engine lets the connection pool
+    amortize that across the whole suite.
+    """
+    engine = sqlalchemy.create_engine(CONNECTION_STRING, pool_pre_ping=True)
+    yield engine
+    engine.dispose()
+
+
+# Tables created during the session; dropped in one batched statement at the
+# end instead of one DDL round-trip per test.
+_TABLES_TO_DROP: set[str] = set()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def drop_registered_tables() -> None:
+    """Drop every registered table in a single statement at session end."""
+    yield
+    if not _TABLES_TO_DROP or not tidb_available:
+        return
+    engine = sqlalchemy.create_engine(CONNECTION_STRING)
+    try:
+        with engine.connect() as connection:
+            connection.execute(
+                sqlalchemy.text(
+                    "DROP TABLE IF EXISTS " + ", ".join(sorted(_TABLES_TO_DROP))
+                )
+            )
+            connection.commit()
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def shared_vector_client(
+    node_embeddings: NodeEmbeddings, shared_engine: sqlalchemy.engine.Engine
+) -> TiDBVectorClient:
+    """Return a client over its own table, loaded once for the whole module.
+
+    The table is only queried, never mutated, so every read-only test can
+    share one insert instead of rebuilding the table per test.
+    """
+    tidb_vs = TiDBVectorClient(
+        table_name=SHARED_TABLE_NAME,
+        connection_string=CONNECTION_STRING,
+        engine=shared_engine,
+        vector_dimension=ADA_TOKEN_COUNT,
+        distance_strategy="cosine",  # type: ignore
+        drop_existing_table=True,
+    )
+    tidb_vs.insert(
+        ids=node_embeddings[0],
+        texts=node_embeddings[1],
+        embeddings=node_embeddings[2],
+        metadatas=_metadatas_as_dicts(),
+    )
+    _TABLES_TO_DROP.add(SHARED_TABLE_NAME)
+    return tidb_vs
+
+
+@pytest.fixture(scope="module")
+def _module_vector_client(shared_engine: sqlalchemy.engine.Engine) -> TiDBVectorClient:
+    """Backing client for fresh_vector_client, created once per module."""
+    tidb_vs = TiDBVectorClient(
+        table_name=FRESH_TABLE_NAME,
+        connection_string=CONNECTION_STRING,
+        engine=shared_engine,
+        vector_dimension=ADA_TOKEN_COUNT,
+        distance_strategy="cosine",  # type: ignore
+        drop_existing_table=True,
+    )
+    _TABLES_TO_DROP.add(FRESH_TABLE_NAME)
+    return tidb_vs
+
+
+@pytest.fixture
+def fresh_vector_client(_module_vector_client: TiDBVectorClient) -> TiDBVectorClient:
+    """Return a client over an empty table without paying per-test DDL.
+
+    The table is created once per module and emptied with TRUNCATE between
+    tests, which is much cheaper than a DROP + CREATE round-trip on TiDB.
+    """
+    _module_vector_client.execute(f"TRUNCATE TABLE {FRESH_TABLE_NAME}")
+    return _module_vector_client
+
+
+def _matches_filter(metadata: dict, filter: dict | None) -> bool:
+    """Evaluate a metadata filter locally, mirroring _build_filter_clause."""
+    if filter is None:
+        return True
+    for key, value in filter.items():
+        if key.lower() == "$and":
+            if not all(_matches_filter(metadata, condition) for condition in value):
+                return False
+        elif key.lower() == "$or":
+            if not any(_matches_filter(metadata, condition) for condition in value):
+                return False
+        elif isinstance(value, dict):
+            if not _matches_condition(metadata.get(key), value):
+                return False
+        elif metadata.get(key) != value:
+            return False
+    return True
+
+
+def _matches_condition(actual, condition: dict) -> bool:
+    """Evaluate a single operator condition, mirroring _create_filter_clause."""
+    operators = {key.lower(): value for key, value in condition.items()}
+    if "$in" in operators:
+        return actual in operators["$in"]
+    if "$nin" in operators:
+        return actual not in operators["$nin"]
+    if "$gt" in operators:
+        return actual > operators["$gt"]
+    if "$gte" in operators:
+        return actual >= operators["$gte"]
+    if "$lt" in operators:
+        return actual < operators["$lt"]
+    if "$lte" in operators:
+        return actual <= operators["$lte"]
+    if "$ne" in operators:
+        return actual != operators["$ne"]
+    if "$eq" in operators:
+        return actual == operators["$eq"]
+    raise ValueError(f"Unsupported filter condition: {condition}")
+
+
+def expected_result_ids(query_text: str, filter: dict | None, k: int = 3) -> list[str]:
+    """Compute the expected ids of a filtered query from the local data set.
+
+    The 3-row fixture is small enough to evaluate every filter in Python, so
+    each query round-trip can be checked against the full expected result
+    list instead of spot-checking sizes and first distances.
+    """
+    query = text_to_embedding(query_text).astype(np.float64)
+    matches = [
+        index
+        for index, metadata in enumerate(_METADATAS)
+        if _matches_filter(metadata, filter)
     ]
-    documents = ["foo", "bar", "baz"]
-    metadatas = [
-        {"page": 1, "category": "P1"},
+    matches.sort(
+        key=lambda index: 1
+        - np.dot(query, _EMBEDDINGS[index].astype(np.float64))
+        / (np.linalg.norm(query) * np.linalg.norm(_EMBEDDINGS[index]))
+    )
+    return [_IDS[index] for index in matches[:k]]
+
+
+# Filter cases run against the shared 3-row table:
+# (query text, filter, expected result size, expected first distance).
+QUERY_FILTER_CASES = [
+    pytest.param("foo", {"category": "P1"}, 2, 0.0, id="category-match"),
+    pytest.param("foo", {"category": "P2"}, 1, DIST_FOO_BAZ, id="category-match-other"),
+    pytest.param("foo", {"category": "P3"}, 0, None, id="category-unmatch"),
+    pytest.param(
+        "foo",
         {"page": 2, "category": "P1"},
-        {"page": 3, "category": "P2"},
-    ]
-    return (ids, documents, embeddings, metadatas)
+        1,
+        DIST_FOO_BAR,
+        id="page-and-category",
+    ),
+    pytest.param(
+        "foo", {"page": 1, "category": "P2"}, 0, None, id="page-and-category-unmatch"
+    ),
+    pytest.param(
+        "foo",
+        {"page": {"$gt": 1}, "category": "P1"},
+        1,
+        DIST_FOO_BAR,
+        id="gt-and-category",
+    ),
+    pytest.param(
+        "foo",
+        {"page": {"$gt": 1}, "category": {"$ne": "P2"}},
+        1,
+        DIST_FOO_BAR,
+        id="gt-and-ne",
+    ),
+    pytest.param(
+        "foo",
+        {"page": {"$gt": 1}, "category": {"$ne": "P1"}},
+        1,
+        DIST_FOO_BAZ,
+        id="gt-and-ne-other",
+    ),
+    pytest.param(
+        "foo",
+        {"page": {"$in": [2, 3]}, "category": {"$ne": "P1"}},
+        1,
+        DIST_FOO_BAZ,
+        id="in-and-ne",
+    ),
+    pytest.param(
+        "foo",
+        {"page": {"$nin": [2, 3]}, "category": {"$ne": "P1"}},
+        0,
+        None,
+        id="nin-and-ne",
+    ),
+    pytest.param("baz", {"page": {"$lte": 2}}, 2, DIST_BAR_BAZ, id="lte-other-query"),
+]
+
+# Single-operator filter cases against the "page" metadata key:
+# (operator, operand, pages of the rows expected to match).
+OPERATOR_CASES = [
+    pytest.param("$gt", 1, {2, 3}, id="gt"),
+    pytest.param("$gte", 2, {2, 3}, id="gte"),
+    pytest.param("$lt", 4, {1, 2, 3}, id="lt"),
+    pytest.param("$lte", 2, {1, 2}, id="lte"),
+    pytest.param("$eq", 2, {2}, id="eq"),
+    pytest.param("$ne", 2, {1, 3}, id="ne"),
+    pytest.param("$in", [2, 3], {2, 3}, id="in"),
+    pytest.param("$nin", [2, 3], {1}, id="nin"),
+]
+
+# Complex filter cases, issued concurrently by test_complex_query:
+# (case id, query text, filter, expected result size, expected first distance).
+COMPLEX_FILTER_CASES = [
+    (
+        "and",
+        "foo",
+        {"$and": [{"page": {"$gt": 1}}, {"category": "P1"}]},
+        1,
+        DIST_FOO_BAR,
+    ),
+    ("or", "foo", {"$or": [{"page": {"$gt": 1}}, {"category": "P1"}]}, 3, 0.0),
+    (
+        "and-with-or",
+        "foo",
+        {
+            "$and": [{"page": {"$gt": 1}}, {"category": "P1"}],
+            "$or": [{"page": {"$gt": 1}}, {"category": "P1"}],
+        },
+        1,
+        DIST_FOO_BAR,
+    ),
+    (
+        "and-with-key",
+        "foo",
+        {"$and": [{"page": {"$gt": 1}}, {"category": "P1"}], "page": 1},
+        0,
+        None,
+    ),
+    (
+        "or-with-key",
+        "foo",
+        {"$or": [{"page": {"$gt": 1}}, {"category": "P1"}], "page": 1},
+        1,
+        0.0,
+    ),
+    (
+        "and-or-and-key",
+        "foo",
+        {
+            "$and": [{"page": {"$gt": 1}}, {"category": "P1"}],
+            "page": 2,
+            "$or": [{"page": {"$gt": 1}}, {"category": "P1"}],
+        },
+        1,
+        DIST_FOO_BAR,
+    ),
+    (
+        "nested-and",
+        "foo",
+        {
+            "$and": [
+                {"$and": [{"page": {"$gt": 1}}, {"page": {"$lt": 3}}], "category": "P2"}
+            ]
+        },
+        0,
+        None,
+    ),
+    (
+        "nested-and-or",
+        "foo",
+        {
+            "$and": [
+                {
+                    "$and": [{"page": {"$gt": 1}}, {"page": {"$lt": 3}}],
+                    "$or": [{"page": {"$gt": 2}}, {"category": {"$eq": "P1"}}],
+                }
+            ]
+        },
+        1,
+        DIST_FOO_BAR,
+    ),
+    (
+        "nested-or-and",
+        "foo",
+        {
+            "$or": [
+                {
+                    "$and": [{"page": {"$gt": 1}}, {"page": {"$lt": 3}}],
+                    "category": "P2",
+                },
+                {"category": "P2"},
+            ]
+        },
+        1,
+        DIST_FOO_BAZ,
+    ),
+    (
+        "nested-or-or",
+        "foo",
+        {
+            "$or": [
+                {
+                    "$and": [{"page": {"$gt": 1}}, {"page": {"$lt": 3}}],
+                    "$or": [{"page": {"$lt": 3}}, {"category": {"$eq": "P2"}}],
+                },
+                {"category": "P2"},
+            ]
+        },
+        2,
+        DIST_FOO_BAR,
+    ),
+]
+
+# Filters that reduce to the same predicate; each pair must return identical
+# rows. The degenerate forms ("$and"/"$or" with a single clause, "$eq" spelled
+# out) used to be standalone cases that re-ran predicates already covered
+# above, so only one representative per equivalence class runs there.
+EQUIVALENT_FILTER_CASES = [
+    pytest.param({"page": 1}, {"$and": [{"page": 1}]}, id="and-single"),
+    pytest.param({"page": 1}, {"$or": [{"page": 1}]}, id="or-single"),
+    pytest.param({"page": 2}, {"page": {"$eq": 2}}, id="eq-plain"),
+]
+
+
+def assert_baseline_rows(client: TiDBVectorClient, ids: list[str] = None) -> None:
+    """Query for "foo" and assert the 3-row baseline insert is intact."""
+    results = client.query(text_to_embedding("foo"), k=3)
+    assert len(results) == 3
+    assert results[0].document == _DOCUMENTS[0]
+    assert results[0].distance == pytest.approx(0.0, abs=1e-12)
+    assert results[0].id == (ids if ids is not None else _IDS)[0]
 
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_basic_search(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    node_embeddings: NodeEmbeddings, fresh_vector_client: TiDBVectorClient
 ) -> None:
     """Test end to end tidb vector construction and search."""
 
-    tidb_vs = TiDBVectorClient(
-        table_name=TABLE_NAME,
-        connection_string=CONNECTION_STRING,
-        vector_dimension=ADA_TOKEN_COUNT,
-        drop_existing_table=True,
-    )
+    tidb_vs = fresh_vector_client
 
     # Add document to the tidb vector
     tidb_vs.insert(
@@ -77,19 +461,27 @@ def test_basic_search(
     )
 
     # similarity search
-    results = tidb_vs.query(text_to_embedding("foo"), k=3)
-    tidb_vs.drop_table()
+    assert_baseline_rows(tidb_vs)
 
-    # Check results
-    assert len(results) == 3
-    assert results[0].document == node_embeddings[1][0]
-    assert results[0].distance == 0.0
-    assert results[0].id == node_embeddings[0][0]
+
+@pytest.mark.skipif(not tidb_available, reason="tidb is not available")
+def test_dense_embeddings(fresh_vector_client: TiDBVectorClient) -> None:
+    """Test top-1 recall on dense embeddings."""
+
+    tidb_vs = fresh_vector_client
+    ids = tidb_vs.insert(texts=_DOCUMENTS, embeddings=_DENSE)
+
+    for index, row in enumerate(_DENSE):
+        results = tidb_vs.query(row, k=1)
+        assert len(results) == 1
+        assert results[0].id == ids[index]
+        assert results[0].document == _DOCUMENTS[index]
+        assert results[0].distance == pytest.approx(0.0, abs=1e-6)
 
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_mismatch_dimension(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    node_embeddings: NodeEmbeddings, shared_engine: sqlalchemy.engine.Engine
 ) -> None:
     """Test mismatch vector dimension."""
 
@@ -97,6 +489,7 @@ def test_mismatch_dimension(
         tidb_vs = TiDBVectorClient(
             table_name=TABLE_NAME,
             connection_string=CONNECTION_STRING,
+            engine=shared_engine,
             vector_dimension=ADA_TOKEN_COUNT - 1,
             drop_existing_table=True,
         )
@@ -113,6 +506,7 @@ def test_mismatch_dimension(
         _ = TiDBVectorClient(
             table_name=TABLE_NAME,
             connection_string=CONNECTION_STRING,
+            engine=shared_engine,
             vector_dimension=ADA_TOKEN_COUNT,
         )
         assert (
@@ -124,16 +518,17 @@ def test_mismatch_dimension(
     tidb_vs2 = TiDBVectorClient(
         table_name=TABLE_NAME,
         connection_string=CONNECTION_STRING,
+        engine=shared_engine,
     )
     tidb_vs2_vector_dimension = tidb_vs2._vector_dimension
-    tidb_vs.drop_table()
+    _TABLES_TO_DROP.add(TABLE_NAME)
 
     assert tidb_vs2_vector_dimension == ADA_TOKEN_COUNT - 1, "vector dimension mismatch"
 
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_mismatch_distance_algorithm(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    node_embeddings: NodeEmbeddings, shared_engine: sqlalchemy.engine.Engine
 ) -> None:
     """Test mismatch vector dimension."""
 
@@ -142,6 +537,7 @@ def test_mismatch_distance_algorithm(
         tidb_vs = TiDBVectorClient(
             table_name=TABLE_NAME,
             connection_string=CONNECTION_STRING,
+            engine=shared_engine,
             distance_strategy="l2",  # type: ignore
             drop_existing_table=True,
         )
@@ -153,6 +549,7 @@ def test_mismatch_distance_algorithm(
     tidb_vs = TiDBVectorClient(
         table_name=TABLE_NAME,
         connection_string=CONNECTION_STRING,
+        engine=shared_engine,
         vector_dimension=ADA_TOKEN_COUNT,
         distance_strategy="l2",  # type: ignore
         drop_existing_table=True,
@@ -167,6 +564,7 @@ def test_mismatch_distance_algorithm(
         _ = TiDBVectorClient(
             table_name=TABLE_NAME,
             connection_string=CONNECTION_STRING,
+            engine=shared_engine,
             distance_strategy="cosine",  # type: ignore
             vector_dimension=ADA_TOKEN_COUNT,
         )
@@ -179,10 +577,11 @@ def test_mismatch_distance_algorithm(
     tidb_vs2 = TiDBVectorClient(
         table_name=TABLE_NAME,
         connection_string=CONNECTION_STRING,
+        engine=shared_engine,
     )
     tidb_vs2_vector_dimension = tidb_vs2._vector_dimension
     tidb_vs2_vector_distance = tidb_vs2._distance_strategy
-    tidb_vs.drop_table()
+    _TABLES_TO_DROP.add(TABLE_NAME)
 
     assert tidb_vs2_vector_dimension == ADA_TOKEN_COUNT, "vector dimension mismatch"
     assert tidb_vs2_vector_distance == "l2", "vector distance algorithm mismatch"
@@ -190,7 +589,7 @@ def test_mismatch_distance_algorithm(
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_various_distance_strategies(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    node_embeddings: NodeEmbeddings, shared_engine: sqlalchemy.engine.Engine
 ) -> None:
     """Test various distance strategies."""
     distance_strategies = ["l2", "cosine"]
@@ -198,6 +597,7 @@ def test_various_distance_strategies(
         tidb_vs = TiDBVectorClient(
             table_name=TABLE_NAME,
             connection_string=CONNECTION_STRING,
+            engine=shared_engine,
             vector_dimension=ADA_TOKEN_COUNT,
             distance_strategy=distance_strategy,  # type: ignore
             drop_existing_table=True,
@@ -212,7 +612,6 @@ def test_various_distance_strategies(
 
         # similarity search
         results = tidb_vs.query(text_to_embedding("foo"), k=3)
-        tidb_vs.drop_table()
 
         # Check results
         assert len(results) == 3
@@ -224,6 +623,7 @@ def test_various_distance_strategies(
             table_name=TABLE_NAME,
             vector_dimension=ADA_TOKEN_COUNT,
             connection_string=CONNECTION_STRING,
+            engine=shared_engine,
             distance_strategy="error",  # type: ignore
             drop_existing_table=True,
         )
@@ -231,12 +631,12 @@ def test_various_distance_strategies(
     except ValueError:
         pass
 
-    tidb_vs.drop_table()
+    _TABLES_TO_DROP.add(TABLE_NAME)
 
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_get_existing_table(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    node_embeddings: NodeEmbeddings, shared_engine: sqlalchemy.engine.Engine
 ) -> None:
     """Test get existing vector table."""
 
@@ -244,6 +644,7 @@ def test_get_existing_table(
     tidb_vs = TiDBVectorClient(
         table_name=TABLE_NAME,
         connection_string=CONNECTION_STRING,
+        engine=shared_engine,
         vector_dimension=ADA_TOKEN_COUNT,
         distance_strategy="cosine",  # type: ignore
         drop_existing_table=True,
@@ -253,35 +654,35 @@ def test_get_existing_table(
         texts=node_embeddings[1],
         ids=node_embeddings[0],
         embeddings=node_embeddings[2],
-        metadatas=node_embeddings[3],
+        metadatas=_metadatas_as_dicts(),
     )
 
     # try to get the existing vector table
     tidb_vs2 = TiDBVectorClient(
         table_name=TABLE_NAME,
         connection_string=CONNECTION_STRING,
+        engine=shared_engine,
     )
-    results = tidb_vs2.query(text_to_embedding("bar"), k=3)
+    bar_emb = text_to_embedding("bar")
+    results = tidb_vs2.query(bar_emb, k=3)
     # delete the table
     tidb_vs2.drop_table()
     # check the results
     assert len(results) == 3
     assert results[0].document == node_embeddings[1][1]
-    assert results[0].distance == 0.0
+    assert results[0].distance == pytest.approx(0.0, abs=1e-12)
     assert results[0].id == node_embeddings[0][1]
 
     # it should fail if the table had been dropped
-    try:
-        results = tidb_vs.query(text_to_embedding("bar"), k=3)
-        assert False, "dropped table testing raised an error"
-    except Exception:
-        pass
+    with pytest.raises(sqlalchemy.exc.DatabaseError):
+        tidb_vs.query(bar_emb, k=3)
 
     # try to check table existence
     assert (
         check_table_existence(
             table_name=TABLE_NAME,
             connection_string=CONNECTION_STRING,
+            engine=shared_engine,
         )
         is False
     ), "non-existing table testing raised an error"
@@ -289,13 +690,14 @@ def test_get_existing_table(
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_insert(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    node_embeddings: NodeEmbeddings, shared_engine: sqlalchemy.engine.Engine
 ) -> None:
     """Test insert function."""
 
     tidb_vs = TiDBVectorClient(
         table_name=TABLE_NAME,
         connection_string=CONNECTION_STRING,
+        engine=shared_engine,
         vector_dimension=ADA_TOKEN_COUNT,
         distance_strategy="l2",  # type: ignore
         drop_existing_table=True,
@@ -305,473 +707,225 @@ def test_insert(
     ids = tidb_vs.insert(
         texts=node_embeddings[1],
         embeddings=node_embeddings[2],
-        metadatas=node_embeddings[3],
+        metadatas=_metadatas_as_dicts(),
     )
 
     results = tidb_vs.query(text_to_embedding("bar"), k=3)
 
     assert len(results) == 3
     assert results[0].document == node_embeddings[1][1]
-    assert results[0].distance == 0.0
+    assert results[0].distance == pytest.approx(0.0, abs=1e-12)
     assert results[0].id == ids[1]
 
+    _TABLES_TO_DROP.add(TABLE_NAME)
+
     # Insert duplicate ids, it should raise an error
     try:
         _ = tidb_vs.insert(
             ids=ids,
             texts=node_embeddings[1],
             embeddings=node_embeddings[2],
-            metadatas=node_embeddings[3],
+            metadatas=_metadatas_as_dicts(),
         )
-        tidb_vs.drop_table()
         assert False, "inserting to existing table raised an error"
     except sqlalchemy.exc.IntegrityError:
-        tidb_vs.drop_table()
         pass
 
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_delete(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    node_embeddings: NodeEmbeddings, fresh_vector_client: TiDBVectorClient
 ) -> None:
     """Test delete function."""
 
-    # prepare data
-    tidb_vs = TiDBVectorClient(
-        table_name=TABLE_NAME,
-        connection_string=CONNECTION_STRING,
-        vector_dimension=ADA_TOKEN_COUNT,
-        distance_strategy="cosine",  # type: ignore
-        drop_existing_table=True,
-    )
-
+    # Prepare the baseline rows plus a second copy with generated ids, all
+    # up front. The delete sub-cases then walk the state down step by step
+    # instead of re-inserting between cases; a SAVEPOINT-based restore is
+    # not an option because the client commits every call itself.
+    tidb_vs = fresh_vector_client
     ids = tidb_vs.insert(
         ids=node_embeddings[0],
         texts=node_embeddings[1],
         embeddings=node_embeddings[2],
-        metadatas=node_embeddings[3],
+        metadatas=_metadatas_as_dicts(),
+    )
+    dup_ids = tidb_vs.insert(
+        texts=node_embeddings[1],
+        embeddings=node_embeddings[2],
+        metadatas=_metadatas_as_dicts(),
     )
 
-    results = tidb_vs.query(text_to_embedding("foo"), k=3)
-
-    assert len(results) == 3
+    foo_emb = text_to_embedding("foo")
+    results = tidb_vs.query(foo_emb, k=10)
+    assert len(results) == 6
     assert results[0].document == node_embeddings[1][0]
-    assert results[0].distance == 0.0
-    assert results[0].id == node_embeddings[0][0]
+    assert results[0].distance == pytest.approx(0.0, abs=1e-12)
 
-    # test delete by id
-
-    # it should fail to delete first two documents conflicted with meta filter
+    # it should fail to delete the first two documents conflicted with meta filter
     tidb_vs.delete([ids[1], ids[0]], filter={"category": "P2"})
-    results = tidb_vs.query(text_to_embedding("foo"), k=4)
-    assert len(results) == 3
-    assert results[0].document == node_embeddings[1][0]
-    assert results[0].distance == 0.0
-    assert results[0].id == ids[0]
+    results = tidb_vs.query(foo_emb, k=10)
+    assert len(results) == 6
 
-    # it should delete the first document just filtered by id
+    # it should delete the first two documents just filtered by id
     tidb_vs.delete([ids[1], ids[0]])
-    results = tidb_vs.query(text_to_embedding("foo"), k=4)
-    assert len(results) == 1
-    assert results[0].document == node_embeddings[1][2]
-    assert results[0].distance == 0.004691842206844599
-    assert results[0].id == node_embeddings[0][2]
-
-    # insert the document back with different id
-    ids = tidb_vs.insert(
-        texts=node_embeddings[1],
-        embeddings=node_embeddings[2],
-        metadatas=node_embeddings[3],
-    )
-
-    results = tidb_vs.query(text_to_embedding("foo"), k=5)
+    results = tidb_vs.query(foo_emb, k=10)
     assert len(results) == 4
     assert results[0].document == node_embeddings[1][0]
-    assert results[0].distance == 0.0
-    assert results[0].id == ids[0]
+    assert results[0].distance == pytest.approx(0.0, abs=1e-12)
+    assert results[0].id == dup_ids[0]
 
-    # test delete first document by filter and ids
-    tidb_vs.delete([ids[1], ids[0]], filter={"page": 1})
-    results = tidb_vs.query(text_to_embedding("foo"), k=5)
+    # test delete the remaining "foo" by filter and ids ("bar" does not match)
+    tidb_vs.delete([dup_ids[1], dup_ids[0]], filter={"page": 1})
+    results = tidb_vs.query(foo_emb, k=10)
     assert len(results) == 3
     assert results[0].document == node_embeddings[1][1]
+    assert results[0].distance == pytest.approx(DIST_FOO_BAR, rel=1e-9)
     assert results[1].document == node_embeddings[1][2]
     assert results[1].distance == results[2].distance
 
-    # insert the document back with different id
-    ids = tidb_vs.insert(
-        texts=node_embeddings[1],
-        embeddings=node_embeddings[2],
-        metadatas=node_embeddings[3],
-    )
-    results = tidb_vs.query(text_to_embedding("foo"), k=10)
-    assert len(results) == 6
-    assert results[0].document == node_embeddings[1][0]
-    assert results[0].distance == 0.0
-    assert results[0].id == ids[0]
-
     # test delete documents by filters
     tidb_vs.delete(filter={"category": "P1"})
-    results = tidb_vs.query(text_to_embedding("foo"), k=10)
-    assert len(results) == 3
+    results = tidb_vs.query(foo_emb, k=10)
+    assert len(results) == 2
     assert results[0].document == node_embeddings[1][2]
     assert results[1].document == node_embeddings[1][2]
     assert results[0].distance == results[1].distance
-    assert results[1].distance == results[2].distance
 
-    # test delete non_extsting by filter
+    # test delete non_existing rows: by filter, by ids, and by filter and ids.
+    # All three are no-ops, so one verification query at the end is enough.
     tidb_vs.delete(filter={"category": "P1"})
-    results = tidb_vs.query(text_to_embedding("foo"), k=10)
-    assert len(results) == 3
-    assert results[0].document == node_embeddings[1][2]
-    assert results[1].document == node_embeddings[1][2]
-    assert results[0].distance == results[1].distance
-    assert results[1].distance == results[2].distance
-
-    # test delete non_extsting by ids
-    tidb_vs.delete([ids[1], ids[0]])
-    results = tidb_vs.query(text_to_embedding("foo"), k=10)
-    assert len(results) == 3
-    assert results[0].document == node_embeddings[1][2]
-    assert results[1].document == node_embeddings[1][2]
-    assert results[0].distance == results[1].distance
-    assert results[1].distance == results[2].distance
-
-    # test delete non_extsting by filter and ids
-    tidb_vs.delete([ids[1], ids[0]], filter={"category": "P1"})
-    results = tidb_vs.query(text_to_embedding("foo"), k=10)
-    assert len(results) == 3
+    tidb_vs.delete([dup_ids[1], dup_ids[0]])
+    tidb_vs.delete([dup_ids[1], dup_ids[0]], filter={"category": "P1"})
+    results = tidb_vs.query(foo_emb, k=10)
+    assert len(results) == 2
     assert results[0].document == node_embeddings[1][2]
     assert results[1].document == node_embeddings[1][2]
     assert results[0].distance == results[1].distance
-    assert results[1].distance == results[2].distance
-
-    tidb_vs.drop_table()
 
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_query(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    shared_vector_client: TiDBVectorClient, node_embeddings: NodeEmbeddings
 ) -> None:
     """Test query function."""
 
-    # prepare data
-    tidb_vs = TiDBVectorClient(
-        table_name=TABLE_NAME,
-        connection_string=CONNECTION_STRING,
-        vector_dimension=ADA_TOKEN_COUNT,
-        distance_strategy="cosine",  # type: ignore
-        drop_existing_table=True,
-    )
-
-    ids = tidb_vs.insert(
-        ids=node_embeddings[0],
-        texts=node_embeddings[1],
-        embeddings=node_embeddings[2],
-        metadatas=node_embeddings[3],
-    )
-
-    results = tidb_vs.query(text_to_embedding("foo"), k=3)
-    assert len(results) == 3
-    assert results[0].document == node_embeddings[1][0]
-    assert results[0].distance == 0.0
-    assert results[0].id == ids[0]
-
-    # test query by matched filter
-    results = tidb_vs.query(text_to_embedding("foo"), k=3, filter={"category": "P1"})
-    assert len(results) == 2
-    assert results[0].document == node_embeddings[1][0]
-    assert results[0].distance == 0.0
-    assert results[0].id == ids[0]
-
-    # test query by another matched filter
-    results = tidb_vs.query(text_to_embedding("foo"), k=3, filter={"category": "P2"})
-    assert len(results) == 1
-    assert results[0].document == node_embeddings[1][2]
-    assert results[0].distance == 0.004691842206844599
-    assert results[0].id == ids[2]
-
-    # test query by unmatch filter
-    results = tidb_vs.query(text_to_embedding("foo"), k=3, filter={"category": "P3"})
-    assert len(results) == 0
-
-    # test basic filter query
-    results = tidb_vs.query(
-        text_to_embedding("foo"), k=3, filter={"page": 2, "category": "P1"}
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0022719614199674387
-
-    results = tidb_vs.query(
-        text_to_embedding("foo"), k=3, filter={"page": 1, "category": "P2"}
-    )
-    assert len(results) == 0
+    tidb_vs = shared_vector_client
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"), k=3, filter={"page": {"$gt": 1}, "category": "P1"}
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0022719614199674387
-
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={"page": {"$gt": 1}, "category": {"$ne": "P2"}},
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0022719614199674387
-
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={"page": {"$gt": 1}, "category": {"$ne": "P1"}},
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.004691842206844599
-
-    results = tidb_vs.query(
-        text_to_embedding("foo"), k=3, filter={"page": {"$in": [2, 3]}}
-    )
-    assert len(results) == 2
-    assert results[0].distance == 0.0022719614199674387
-
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={"page": {"$in": [2, 3]}, "category": {"$ne": "P1"}},
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.004691842206844599
-
-    results = tidb_vs.query(
-        text_to_embedding("foo"), k=3, filter={"page": {"$nin": [2, 3]}}
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0
-
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={"page": {"$nin": [2, 3]}, "category": {"$ne": "P1"}},
-    )
-    assert len(results) == 0
-
-    results = tidb_vs.query(text_to_embedding("foo"), k=3, filter={"page": {"$gte": 2}})
-    assert len(results) == 2
-    assert results[0].distance == 0.0022719614199674387
-
-    results = tidb_vs.query(text_to_embedding("foo"), k=3, filter={"page": {"$lt": 4}})
-    assert len(results) == 3
-    assert results[0].distance == 0.0
-
-    results = tidb_vs.query(text_to_embedding("baz"), k=3, filter={"page": {"$lte": 2}})
-    assert len(results) == 2
-    assert results[0].distance == 0.0005609046916807969
-
-    results = tidb_vs.query(text_to_embedding("baz"), k=3, filter={"page": {"$eq": 2}})
-    assert len(results) == 1
-    assert results[0].distance == 0.0005609046916807969
+    assert_baseline_rows(tidb_vs)
 
     try:
         _ = tidb_vs.query(text_to_embedding("foo"), k=3, filter={"$and": [{"$gt": 1}]})
-        tidb_vs.drop_table()
         assert False, "query with invalid filter raised an error"
     except ValueError:
         pass
 
-    tidb_vs.drop_table()
-
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
-def test_complex_query(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+@pytest.mark.parametrize(
+    "query_text,filter,expected_len,expected_distance", QUERY_FILTER_CASES
+)
+def test_query_filter(
+    shared_vector_client: TiDBVectorClient,
+    query_text: str,
+    filter: dict,
+    expected_len: int,
+    expected_distance: float | None,
 ) -> None:
-    """Test complex query function."""
-
-    # prepare data
-    tidb_vs = TiDBVectorClient(
-        table_name=TABLE_NAME,
-        connection_string=CONNECTION_STRING,
-        drop_existing_table=True,
-    )
-
-    ids = tidb_vs.insert(
-        ids=node_embeddings[0],
-        texts=node_embeddings[1],
-        embeddings=node_embeddings[2],
-        metadatas=node_embeddings[3],
-    )
-
-    results = tidb_vs.query(text_to_embedding("foo"), k=3)
-    assert len(results) == 3
-    assert results[0].document == node_embeddings[1][0]
-    assert results[0].distance == 0.0
-    assert results[0].id == ids[0]
+    """Test query function with metadata filters."""
 
-    # test complex query
-    results = tidb_vs.query(
-        text_to_embedding("foo"), k=3, filter={"$and": [{"page": 1}]}
+    results = shared_vector_client.query(
+        text_to_embedding(query_text), k=3, filter=filter
     )
-    assert len(results) == 1
-    assert results[0].distance == 0.0
-
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={"$and": [{"page": {"$gt": 1}}, {"category": "P1"}]},
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0022719614199674387
+    assert [result.id for result in results] == expected_result_ids(query_text, filter)
+    assert len(results) == expected_len
+    if expected_len > 0:
+        assert results[0].distance == pytest.approx(
+            expected_distance, rel=1e-9, abs=1e-12
+        )
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"), k=3, filter={"$or": [{"page": 1}]}
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={"$or": [{"page": {"$gt": 1}}, {"category": "P1"}]},
-    )
-    assert len(results) == 3
-    assert results[0].distance == 0.0
+def run_queries(client: TiDBVectorClient, cases: list) -> list:
+    """Issue the queries for the given cases concurrently.
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={
-            "$and": [{"page": {"$gt": 1}}, {"category": "P1"}],
-            "$or": [{"page": {"$gt": 1}}, {"category": "P1"}],
-        },
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0022719614199674387
+    The cases are independent read-only queries, so instead of paying one
+    round-trip per case the whole batch runs in parallel on the engine's
+    connection pool. Results are returned in case order.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(
+                client.query, text_to_embedding(query_text), k=3, filter=filter
+            )
+            for _, query_text, filter, _, _ in cases
+        ]
+        return [future.result() for future in futures]
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={"$and": [{"page": {"$gt": 1}}, {"category": "P1"}], "page": 1},
-    )
-    assert len(results) == 0
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={"$or": [{"page": {"$gt": 1}}, {"category": "P1"}], "page": 1},
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0
+@pytest.mark.skipif(not tidb_available, reason="tidb is not available")
+@pytest.mark.parametrize("operator,operand,expected_pages", OPERATOR_CASES)
+def test_query_operator(
+    shared_vector_client: TiDBVectorClient,
+    operator: str,
+    operand,
+    expected_pages: set,
+) -> None:
+    """Test every comparison operator against the page metadata key."""
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={
-            "$and": [{"page": {"$gt": 1}}, {"category": "P1"}],
-            "page": 2,
-            "$or": [{"page": {"$gt": 1}}, {"category": "P1"}],
-        },
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0022719614199674387
+    filter = {"page": {operator: operand}}
+    results = shared_vector_client.query(text_to_embedding("foo"), k=3, filter=filter)
+    assert [result.id for result in results] == expected_result_ids("foo", filter)
+    assert {result.metadata["page"] for result in results} == expected_pages
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={
-            "$and": [
-                {
-                    "$and": [
-                        {"page": {"$gt": 1}},
-                        {"page": {"$lt": 3}},
-                    ],
-                    "category": "P2",
-                }
-            ]
-        },
-    )
-    assert len(results) == 0
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={
-            "$and": [
-                {
-                    "$and": [
-                        {"page": {"$gt": 1}},
-                        {"page": {"$lt": 3}},
-                    ],
-                    "$or": [
-                        {"page": {"$gt": 2}},
-                        {"category": {"$eq": "P1"}},
-                    ],
-                }
-            ]
-        },
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.0022719614199674387
+@pytest.mark.skipif(not tidb_available, reason="tidb is not available")
+def test_complex_query(shared_vector_client: TiDBVectorClient) -> None:
+    """Test complex query function."""
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={
-            "$or": [
-                {
-                    "$and": [
-                        {"page": {"$gt": 1}},
-                        {"page": {"$lt": 3}},
-                    ],
-                    "category": "P2",
-                },
-                {
-                    "category": "P2",
-                },
-            ]
-        },
-    )
-    assert len(results) == 1
-    assert results[0].distance == 0.004691842206844599
+    all_results = run_queries(shared_vector_client, COMPLEX_FILTER_CASES)
+    for (case_id, query_text, filter, expected_len, expected_distance), results in zip(
+        COMPLEX_FILTER_CASES, all_results
+    ):
+        assert [result.id for result in results] == expected_result_ids(
+            query_text, filter
+        ), case_id
+        assert len(results) == expected_len, case_id
+        if expected_len > 0:
+            assert results[0].distance == pytest.approx(
+                expected_distance, rel=1e-9, abs=1e-12
+            ), case_id
 
-    results = tidb_vs.query(
-        text_to_embedding("foo"),
-        k=3,
-        filter={
-            "$or": [
-                {
-                    "$and": [
-                        {"page": {"$gt": 1}},
-                        {"page": {"$lt": 3}},
-                    ],
-                    "$or": [
-                        {"page": {"$lt": 3}},
-                        {"category": {"$eq": "P2"}},
-                    ],
-                },
-                {
-                    "category": "P2",
-                },
-            ]
-        },
-    )
-    assert len(results) == 2
-    assert results[0].distance == 0.0022719614199674387
 
-    tidb_vs.drop_table()
+@pytest.mark.skipif(not tidb_available, reason="tidb is not available")
+@pytest.mark.parametrize("filter,equivalent_filter", EQUIVALENT_FILTER_CASES)
+def test_filter_equivalence(
+    shared_vector_client: TiDBVectorClient,
+    filter: dict,
+    equivalent_filter: dict,
+) -> None:
+    """Test that logically equivalent filters return identical rows."""
+
+    results, equivalent_results = run_queries(
+        shared_vector_client,
+        [
+            (None, "foo", filter, None, None),
+            (None, "foo", equivalent_filter, None, None),
+        ],
+    )
+    assert [result.id for result in results] == expected_result_ids("foo", filter)
+    assert [result.id for result in results] == [
+        result.id for result in equivalent_results
+    ]
 
 
 @pytest.mark.skipif(not tidb_available, reason="tidb is not available")
 def test_execute(
-    node_embeddings: Tuple[list[str], list[str], list[list[float]], list[dict]]
+    node_embeddings: NodeEmbeddings,
+    fresh_vector_client: TiDBVectorClient,
+    shared_engine: sqlalchemy.engine.Engine,
 ) -> None:
     """Test execute method with SELECT query."""
 
-    tidb_vs = TiDBVectorClient(
-        table_name=TABLE_NAME,
-        connection_string=CONNECTION_STRING,
-        drop_existing_table=True,
-    )
+    tidb_vs = fresh_vector_client
 
     # Insert data into the table
     tidb_vs.insert(
@@ -819,6 +973,7 @@ def test_execute(
         check_table_existence(
             table_name="test_tidb_vector_execution_function",
             connection_string=CONNECTION_STRING,
+            engine=shared_engine,
         )
         is False
     ), "Table test_tidb_vector_execution_function should not exist"
@@ -827,5 +982,3 @@ def test_execute(
     result = tidb_vs.execute("SELECT * FROM test_tidb_vector_execution_function")
     assert result["success"] is False
     assert result["error"] is not None
-
-    tidb_vs.drop_table()
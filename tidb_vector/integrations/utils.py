@@ -24,6 +24,7 @@ def check_table_existence(
     connection_string: str,
     table_name: str,
     engine_args: Optional[Dict[str, Any]] = None,
+    engine: Optional[sqlalchemy.engine.Engine] = None,
 ) -> bool:
     """
     Check if the vector table exists in the database
@@ -32,16 +33,21 @@ def check_table_existence(
         connection_string (str): The connection string for the database.
         table_name (str): The name of the table to check.
         engine_args (Optional[Dict[str, Any]]): Additional arguments for the engine.
+        engine (Optional[sqlalchemy.engine.Engine]): An existing engine to reuse
+            instead of creating a temporary one, defaults to None.
 
     Returns:
         bool: True if the table exists, False otherwise.
     """
-    engine = sqlalchemy.create_engine(connection_string, **(engine_args or {}))
+    owns_engine = engine is None
+    if engine is None:
+        engine = sqlalchemy.create_engine(connection_string, **(engine_args or {}))
     try:
         inspector = sqlalchemy.inspect(engine)
         return table_name in inspector.get_table_names()
     finally:
-        engine.dispose()
+        if owns_engine:
+            engine.dispose()
 
 
 def get_embedding_column_definition(
@@ -49,6 +55,7 @@ def get_embedding_column_definition(
     table_name: str,
     column_name: str,
     engine_args: Optional[Dict[str, Any]] = None,
+    engine: Optional[sqlalchemy.engine.Engine] = None,
 ):
     """
     Retrieves the column definition of an embedding column from a database table.
@@ -58,11 +65,15 @@ def get_embedding_column_definition(
         table_name (str): The name of the table.
         column_name (str): The name of the column.
         engine_args (Optional[Dict[str, Any]]): Additional arguments for the engine.
+        engine (Optional[sqlalchemy.engine.Engine]): An existing engine to reuse
+            instead of creating a temporary one, defaults to None.
 
     Returns:
         tuple: A tuple containing the dimension (int or None) and distance metric (str or None).
     """
-    engine = sqlalchemy.create_engine(connection_string, **(engine_args or {}))
+    owns_engine = engine is None
+    if engine is None:
+        engine = sqlalchemy.create_engine(connection_string, **(engine_args or {}))
     try:
         with engine.connect() as connection:
             query = f"""SELECT COLUMN_TYPE, COLUMN_COMMENT
@@ -72,7 +83,8 @@ def get_embedding_column_definition(
             if result:
                 return extract_info_from_column_definition(result[0], result[1])
     finally:
-        engine.dispose()
+        if owns_engine:
+            engine.dispose()
 
     return None, None
 
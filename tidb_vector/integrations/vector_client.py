@@ -82,6 +82,7 @@ class TiDBVectorClient:
         distance_strategy: Optional[DistanceStrategy] = None,
         vector_dimension: Optional[int] = None,
         *,
+        engine: Optional[sqlalchemy.engine.Engine] = None,
         engine_args: Optional[Dict[str, Any]] = None,
         drop_existing_table: bool = False,
         **kwargs: Any,
@@ -95,6 +96,10 @@ class TiDBVectorClient:
             table_name (str): The name of the table used to store the vectors.
             distance_strategy: The strategy used for similarity search,
                 defaults to "cosine", valid values: "l2", "cosine".
+            engine (Optional[sqlalchemy.engine.Engine]): An existing engine to
+                reuse instead of creating a new one from the connection string,
+                useful to share one connection pool between clients,
+                defaults to None.
             engine_args (Optional[Dict]): Additional arguments for the database engine,
                 defaults to None.
             drop_existing_table: Delete the table before creating a new one,
@@ -110,7 +115,7 @@ class TiDBVectorClient:
         self._table_name = table_name
         self._engine_args = engine_args or {}
         self._drop_existing_table = drop_existing_table
-        self._bind = self._create_engine()
+        self._bind = engine if engine is not None else self._create_engine()
         self._check_table_compatibility()  # check if the embedding is compatible
         self._orm_base, self._table_model = _create_vector_table_model(
             table_name, vector_dimension, distance_strategy
@@ -130,6 +135,7 @@ class TiDBVectorClient:
             table_name=self._table_name,
             column_name="embedding",
             engine_args=self._engine_args,
+            engine=self._bind,
         )
         if actual_dim is not None:
             # If the vector dimension is not set, set it to the actual dimension